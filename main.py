@@ -1,17 +1,28 @@
+import argparse
 import boto3
+import botocore.exceptions
+from botocore.config import Config
 import pandas as pd
 import os
+import json
+import glob
+import fcntl
+import time
+import hashlib
+import mimetypes
 import shutil
+import tempfile
 from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 from plotly.graph_objs import Scatter, Layout, Figure
-from plotly.offline import plot
 from jinja2 import Template, Environment
 import subprocess
 import webbrowser
-from urllib.parse import quote
 
-# AWS Resources
-session = boto3.Session(profile_name='s33ding', region_name='us-east-1')
+# AWS Resources (PROGRESS_AWS_PROFILE overrides the profile; set it empty to
+# fall back to the default credential chain)
+session = boto3.Session(profile_name=os.environ.get('PROGRESS_AWS_PROFILE', 's33ding') or None, region_name='us-east-1')
 dynamodb = session.resource('dynamodb')
 s3 = session.client('s3')
 
@@ -19,6 +30,17 @@ s3 = session.client('s3')
 TABLE_NAME = 'ProgressTracker'
 BUCKET_NAME = 's33ding-progress'
 BASE_URL = f'https://{BUCKET_NAME}.s3.amazonaws.com'
+ARCHIVE_PREFIX = 'archive'
+# Local state lives next to this script (or in PROGRESS_STATE_DIR), not in the
+# working directory, so cron and the interactive CLI share one journal.
+STATE_DIR = os.environ.get('PROGRESS_STATE_DIR') or os.path.dirname(os.path.abspath(__file__))
+ARCHIVE_DIR = os.path.join(STATE_DIR, 'archive')
+JOURNAL_PATH = os.path.join(STATE_DIR, 'journal.jsonl')
+ITEMS_CACHE_PATH = os.path.join(STATE_DIR, 'items.json')
+PUBLISH_PENDING_PATH = f'{JOURNAL_PATH}.publish-pending'
+ROLLUP_PERIODS = ('daily', 'weekly')
+ARCHIVE_DESTINATIONS = ('s3', 'local')
+AWS_ERRORS = (botocore.exceptions.BotoCoreError, botocore.exceptions.ClientError, boto3.exceptions.S3UploadFailedError)
 
 ITEM_TEMPLATE = '''
 <html>
@@ -110,13 +132,13 @@ ITEM_TEMPLATE = '''
 {% for row in data %}
 <tr>
     <td>{{ row['Timestamp'] }}</td>
-    <td>{{ row['ProgressPercentage'] }}</td>
+    <td>{{ row['ProgressPercentage'] }}{% if row.get('RollupPeriod') %} <span style="color:#aaa;">({{ row['RollupPeriod'] }}, min {{ row['ProgressMin'] }} / max {{ row['ProgressMax'] }})</span>{% endif %}</td>
 </tr>
 {% endfor %}
 </table>
 
 <div class="home-nav">
-    <a class="home-btn" href="https://s33ding-progress.s3.amazonaws.com/index.html" aria-label="Go to homepage">← Home</a>
+    <a class="home-btn" href="../index.html" aria-label="Go to homepage">← Home</a>
 </div>
 
 </body>
@@ -282,6 +304,27 @@ HOMEPAGE_TEMPLATE = '''
         color: #bbb;
         font-size: 1.1em;
     }
+    .pager {
+        display: flex;
+        justify-content: center;
+        align-items: center;
+        gap: 20px;
+        margin-top: 24px;
+        color: #ccc;
+    }
+    .pager button {
+        padding: 8px 16px;
+        background: transparent;
+        border: 2px solid #4a9e5c;
+        border-radius: 8px;
+        color: #4a9e5c;
+        font-weight: 600;
+        cursor: pointer;
+    }
+    .pager button:disabled {
+        opacity: 0.3;
+        cursor: default;
+    }
 </style>
 </head>
 <body>
@@ -289,7 +332,7 @@ HOMEPAGE_TEMPLATE = '''
     <h1>🌱 Progress Tracker</h1>
     
     <div class="search-box">
-        <input type="text" id="searchInput" placeholder="🔍 Filter items..." onkeyup="filterTable()">
+        <input type="text" id="searchInput" placeholder="🔍 Filter items..." oninput="filterTable()">
     </div>
     
     <div class="table-wrapper">
@@ -301,23 +344,14 @@ HOMEPAGE_TEMPLATE = '''
                     <th onclick="sortTable(2)">Progress</th>
                 </tr>
             </thead>
-            <tbody>
-                {% for row in latest_progress %}
-                <tr>
-                    <td><a href="{{ base_url }}/{{ row['ItemID'] | urlencode }}/index.html">{{ row['ItemID'] }}</a></td>
-                    <td class="timestamp" data-timestamp="{{ row['Timestamp'] }}">{{ row['Timestamp'][:19].replace('T', ' ') }}</td>
-                    <td data-progress="{{ row['ProgressPercentage'] }}">
-                        <div class="progress-bar">
-                            <div class="progress-fill" style="width: {{ row['ProgressPercentage'] }}%">
-                                {{ row['ProgressPercentage'] }}%
-                            </div>
-                        </div>
-                    </td>
-                </tr>
-                {% endfor %}
-            </tbody>
+            <tbody id="tableBody"></tbody>
         </table>
         <div id="noResults" class="no-results" style="display:none;">No items found</div>
+        <div class="pager">
+            <button id="prevPage" onclick="changePage(-1)">← Prev</button>
+            <span id="pageInfo"></span>
+            <button id="nextPage" onclick="changePage(1)">Next →</button>
+        </div>
     </div>
 
     <div class="links-container">
@@ -328,56 +362,74 @@ HOMEPAGE_TEMPLATE = '''
 </div>
 
 <script>
+const PAGE_SIZE = 50;
 let sortDir = [1, -1, 1];
+let index = [];   // [ItemID, Timestamp, progress, lowercased ItemID], newest first
+let view = [];
+let page = 0;
+
+function escapeHtml(s) {
+    return String(s).replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}[c]));
+}
+
+function render() {
+    const tbody = document.getElementById('tableBody');
+    const pages = Math.max(1, Math.ceil(view.length / PAGE_SIZE));
+    page = Math.min(Math.max(page, 0), pages - 1);
+
+    tbody.innerHTML = view.slice(page * PAGE_SIZE, (page + 1) * PAGE_SIZE).map(([id, ts, progress]) => `
+        <tr>
+            <td><a href="${encodeURIComponent(id)}/index.html">${escapeHtml(id)}</a></td>
+            <td class="timestamp">${escapeHtml(ts.slice(0, 19).replace('T', ' '))}</td>
+            <td>
+                <div class="progress-bar">
+                    <div class="progress-fill" style="width: ${progress}%">${progress}%</div>
+                </div>
+            </td>
+        </tr>`).join('');
+
+    document.getElementById('noResults').style.display = view.length === 0 ? 'block' : 'none';
+    tbody.style.display = view.length === 0 ? 'none' : '';
+    document.getElementById('pageInfo').textContent = `Page ${page + 1} of ${pages} · ${view.length} items`;
+    document.getElementById('prevPage').disabled = page === 0;
+    document.getElementById('nextPage').disabled = page >= pages - 1;
+}
+
+function changePage(delta) {
+    page += delta;
+    render();
+}
 
 function sortTable(col) {
-    const table = document.getElementById('dataTable');
-    const tbody = table.querySelector('tbody');
-    const rows = Array.from(tbody.querySelectorAll('tr'));
-    const headers = table.querySelectorAll('th');
-    
+    const headers = document.querySelectorAll('#dataTable th');
     headers.forEach((h, i) => {
         h.className = i === col ? (sortDir[col] === 1 ? 'sort-asc' : 'sort-desc') : '';
     });
-    
-    rows.sort((a, b) => {
-        let aVal, bVal;
-        if (col === 0) {
-            aVal = a.cells[0].textContent.trim().toLowerCase();
-            bVal = b.cells[0].textContent.trim().toLowerCase();
-        } else if (col === 1) {
-            aVal = a.cells[1].dataset.timestamp;
-            bVal = b.cells[1].dataset.timestamp;
-        } else {
-            aVal = parseInt(a.cells[2].dataset.progress);
-            bVal = parseInt(b.cells[2].dataset.progress);
-        }
-        return (aVal > bVal ? 1 : -1) * sortDir[col];
-    });
-    
+
+    const key = col === 0 ? 3 : col;
+    const dir = sortDir[col];
+    index.sort((a, b) => (a[key] > b[key] ? 1 : -1) * dir);
     sortDir[col] *= -1;
-    rows.forEach(row => tbody.appendChild(row));
+    filterTable();
 }
 
 function filterTable() {
     const input = document.getElementById('searchInput').value.toLowerCase();
-    const tbody = document.querySelector('#dataTable tbody');
-    const rows = tbody.querySelectorAll('tr');
-    let visibleCount = 0;
-    
-    rows.forEach(row => {
-        const text = row.cells[0].textContent.toLowerCase();
-        if (text.includes(input)) {
-            row.style.display = '';
-            visibleCount++;
-        } else {
-            row.style.display = 'none';
-        }
-    });
-    
-    document.getElementById('noResults').style.display = visibleCount === 0 ? 'block' : 'none';
-    tbody.style.display = visibleCount === 0 ? 'none' : '';
+    view = input ? index.filter(row => row[3].includes(input)) : index;
+    page = 0;
+    render();
 }
+
+fetch('index.json?v={{ version }}')
+    .then(response => response.json())
+    .then(data => {
+        index = data.items.map(([id, ts, progress]) => [id, ts, progress, id.toLowerCase()]);
+        filterTable();
+    })
+    .catch(() => {
+        document.getElementById('noResults').textContent = 'Could not load items';
+        document.getElementById('noResults').style.display = 'block';
+    });
 </script>
 </body>
 </html>
@@ -392,53 +444,241 @@ def create_progress_graph(df, item_id):
                     paper_bgcolor='#1b1b1b', plot_bgcolor='#1b1b1b', font=dict(color='#f0f0f0'),
                     height=700)
     fig = Figure(data=[trace], layout=layout)
-    return plot(fig, output_type='div', include_plotlyjs='cdn')
+    # A stable div id (plotly defaults to a random UUID) keeps rebuilt pages
+    # byte-identical when the data hasn't changed, so sync can skip them.
+    div_id = f"graph-{hashlib.md5(str(item_id).encode()).hexdigest()[:12]}"
+    return fig.to_html(full_html=False, include_plotlyjs='cdn', div_id=div_id)
 
-def write_progress():
-    table = dynamodb.Table(TABLE_NAME)
-    response = table.scan(ProjectionExpression='ItemID')
-    item_ids = sorted(set(item['ItemID'] for item in response['Items']))
+def render_item_page(item_id, items):
+    # Links are relative so the same bytes work on S3 and in a local build,
+    # and publishing and build/sync never fight over a page.
+    items = sorted(items, key=lambda x: x['Timestamp'], reverse=True)
+
+    df = pd.DataFrame(items)
+    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='ISO8601')
+    df['ProgressPercentage'] = df['ProgressPercentage'].astype(int)
+
+    graph_div = create_progress_graph(df, item_id)
+    return Template(ITEM_TEMPLATE).render(item_id=item_id, data=items, graph_div=graph_div)
+
+def publish_item_page(table, item_id):
+    """Render one item's page from its full history, upload it and return its URL."""
+    response = table.query(KeyConditionExpression=boto3.dynamodb.conditions.Key('ItemID').eq(item_id))
+    html = render_item_page(item_id, response['Items'])
+
+    os.makedirs(f'temp/{item_id}', exist_ok=True)
+    with open(f'temp/{item_id}/index.html', 'w') as f:
+        f.write(html)
+
+    s3.upload_file(f'temp/{item_id}/index.html', BUCKET_NAME, f'{item_id}/index.html', ExtraArgs={'ContentType': 'text/html'})
+    shutil.rmtree(f'temp/{item_id}')
+    return f"{BASE_URL}/{item_id}/index.html"
+
+def _lock_journal(mode):
+    """Open the live journal and hold an exclusive flock on it.
+
+    The lock is only taken once the open file is still the one at JOURNAL_PATH:
+    if a flush renamed it away while we waited, we retry on the new journal, so
+    nothing is ever written into a file that has already been claimed. Returns
+    None if mode doesn't create the file and there is no journal.
+    """
+    while True:
+        try:
+            f = open(JOURNAL_PATH, mode)
+        except FileNotFoundError:
+            return None
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            if os.fstat(f.fileno()).st_ino == os.stat(JOURNAL_PATH).st_ino:
+                return f
+        except FileNotFoundError:
+            pass
+        f.close()
+
+def _append_journal(entry):
+    """Durably append one progress entry to the local write-behind journal."""
+    with _lock_journal('a+b') as f:
+        # A crash mid-append can leave a torn last line; start on a fresh one
+        # so the new entry isn't glued onto it.
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+        f.write((json.dumps(entry) + '\n').encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+def _read_journal(path):
+    if not os.path.exists(path):
+        return []
+    entries = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Skipping unreadable journal line in {path}: {line.strip()[:60]}")
+    return entries
+
+def _claim_journal():
+    """Move the live journal aside under a unique claim name and return all claim files.
+
+    The rename happens under the journal's flock, and appends take the same lock
+    and re-check they still have the live file, so every append lands either in
+    the claimed file before it is read or in a fresh journal. Claims left behind
+    by a crashed or failed flush are returned too.
+    """
+    f = _lock_journal('rb')
+    if f is not None:
+        with f:
+            os.replace(JOURNAL_PATH, f'{JOURNAL_PATH}.{time.time_ns()}-{os.getpid()}.flushing')
+    return sorted(glob.glob(f'{JOURNAL_PATH}.*flushing'))
+
+def _pending_entries():
+    """All journal entries not yet in DynamoDB, claimed or not."""
+    entries = []
+    for path in sorted(glob.glob(f'{JOURNAL_PATH}.*flushing')) + [JOURNAL_PATH]:
+        entries.extend(_read_journal(path))
+    return entries
+
+def _drop_journal_entries(item_id):
+    """Remove an item's unflushed entries so a later flush can't bring it back."""
+    for path in _claim_journal():
+        entries = _read_journal(path)
+        kept = [entry for entry in entries if entry['ItemID'] != item_id]
+        if len(kept) == len(entries):
+            continue
+        if not kept:
+            os.remove(path)
+            continue
+        with open(f'{path}.tmp', 'w') as f:
+            for entry in kept:
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f'{path}.tmp', path)
+    _save_publish_pending(_load_publish_pending() - {item_id})
+
+def _load_publish_pending():
+    if not os.path.exists(PUBLISH_PENDING_PATH):
+        return set()
+    with open(PUBLISH_PENDING_PATH) as f:
+        return set(json.load(f))
+
+def _save_publish_pending(item_ids):
     if not item_ids:
-        print("No items found.")
+        if os.path.exists(PUBLISH_PENDING_PATH):
+            os.remove(PUBLISH_PENDING_PATH)
         return
+    with open(f'{PUBLISH_PENDING_PATH}.tmp', 'w') as f:
+        json.dump(sorted(item_ids), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(f'{PUBLISH_PENDING_PATH}.tmp', PUBLISH_PENDING_PATH)
+
+def _load_item_cache():
+    if not os.path.exists(ITEMS_CACHE_PATH):
+        return set()
+    with open(ITEMS_CACHE_PATH) as f:
+        return set(json.load(f))
+
+def _save_item_cache(item_ids):
+    with open(ITEMS_CACHE_PATH, 'w') as f:
+        json.dump(sorted(item_ids), f)
+
+def refresh_item_cache():
+    """Reload the item list from DynamoDB, giving up quickly if AWS is slow or down."""
+    quick = session.resource('dynamodb', config=Config(connect_timeout=2, read_timeout=3, retries={'max_attempts': 1}))
+    try:
+        items = _scan_all(quick.Table(TABLE_NAME), ProjectionExpression='ItemID')
+    except AWS_ERRORS as e:
+        print(f"Couldn't refresh items from DynamoDB ({e}); using the local list.")
+        return _load_item_cache()
+    item_ids = {item['ItemID'] for item in items}
+    _save_item_cache(item_ids)
+    return item_ids
 
-    print("Select an existing item:")
-    for idx, item_id in enumerate(item_ids):
-        print(f"{idx + 1}. {item_id}")
-    selected = int(input("Enter the number: ")) - 1
+def write_progress():
+    # Items come from the local cache (kept current by publishing, create and
+    # delete) plus the journal, so queuing an update never waits on AWS.
+    item_ids = _load_item_cache() or refresh_item_cache()
+    while True:
+        item_ids = sorted(set(item_ids) | {entry['ItemID'] for entry in _pending_entries()})
+        if not item_ids:
+            print("No items found.")
+            return
+
+        print("Select an existing item (r to refresh the list from DynamoDB):")
+        for idx, item_id in enumerate(item_ids):
+            print(f"{idx + 1}. {item_id}")
+        choice = input("Enter the number: ").strip().lower()
+        if choice != 'r':
+            break
+        item_ids = refresh_item_cache()
+
+    selected = int(choice) - 1
     item_id = item_ids[selected]
     print(f"Selected: {selected + 1}. {item_id}")
 
     progress = int(input("Enter current progress %: "))
     timestamp = (datetime.now(timezone.utc) - timedelta(hours=3)).replace(microsecond=0).isoformat()
 
-    table.put_item(Item={'ItemID': item_id, 'Timestamp': timestamp, 'ProgressPercentage': progress})
-    response = table.query(KeyConditionExpression=boto3.dynamodb.conditions.Key('ItemID').eq(item_id))
-    items = sorted(response['Items'], key=lambda x: x['Timestamp'], reverse=True)
+    _append_journal({'ItemID': item_id, 'Timestamp': timestamp, 'ProgressPercentage': progress})
+    print(f"Queued {progress}% for '{item_id}' in {JOURNAL_PATH}.")
 
-    df = pd.DataFrame(items)
-    df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='ISO8601')
-    df['ProgressPercentage'] = df['ProgressPercentage'].astype(int)
+    if input("Flush and publish now? [y/N]: ").strip().lower() == 'y':
+        flush_journal(open_browser=True)
 
-    os.makedirs(f'temp/{item_id}', exist_ok=True)
-    graph_div = create_progress_graph(df, item_id)
-    html = Template(ITEM_TEMPLATE).render(item_id=item_id, data=items, graph_div=graph_div)
-    with open(f'temp/{item_id}/index.html', 'w') as f:
-        f.write(html)
 
-    s3.upload_file(f'temp/{item_id}/index.html', BUCKET_NAME, f'{item_id}/index.html', ExtraArgs={'ContentType': 'text/html'})
-    shutil.rmtree(f'temp/{item_id}')
-    generate_homepage()
-    print(f"Uploaded: {BASE_URL}/{item_id}/index.html")
+def flush_journal(open_browser=False, table=None):
+    # Puts are keyed on ItemID+Timestamp, so re-sending entries from a claim
+    # that was already (partly) written just overwrites them.
+    claims = _claim_journal()
+    entries = [entry for path in claims for entry in _read_journal(path)]
+    pending = {(entry['ItemID'], entry['Timestamp']): entry for entry in entries}
+    publish_pending = _load_publish_pending()
+    if not pending and not publish_pending:
+        print("Journal is empty.")
+        return
 
-    # NEW: open the freshly published page in Firefox
-    url = f"{BASE_URL}/{item_id}/index.html"
-    if _open_in_firefox_new_window(url):
-        print(f"Opening in Firefox: {url}")
-    else:
-        print(f"Couldn't open in Firefox automatically. Please open manually: {url}")
+    table = table or dynamodb.Table(TABLE_NAME)
+    if pending:
+        try:
+            with table.batch_writer(overwrite_by_pkeys=['ItemID', 'Timestamp']) as batch:
+                for entry in pending.values():
+                    batch.put_item(Item=entry)
+        except AWS_ERRORS as e:
+            print(f"Flush failed ({e}); {len(pending)} entries kept for the next flush.")
+            return
+        # Record what still needs publishing before dropping the claims, so a
+        # failed upload below is retried by the next flush.
+        publish_pending |= {item_id for item_id, _ in pending}
+        _save_publish_pending(publish_pending)
+        for path in claims:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        print(f"Flushed {len(pending)} entries.")
 
-    print(f"Uploaded: {url}")
+    item_ids = sorted(publish_pending)
+    try:
+        for item_id in item_ids:
+            print(f"Uploaded: {publish_item_page(table, item_id)}")
+        generate_homepage(table)
+    except AWS_ERRORS as e:
+        print(f"Publishing failed ({e}); pages will be retried on the next flush.")
+        return
+    _save_publish_pending(set())
+
+    if open_browser and len(item_ids) == 1:
+        url = f"{BASE_URL}/{item_ids[0]}/index.html"
+        if _open_in_firefox_new_window(url):
+            print(f"Opening in Firefox: {url}")
+        else:
+            print(f"Couldn't open in Firefox automatically. Please open manually: {url}")
 
 
 def create_item():
@@ -447,6 +687,7 @@ def create_item():
     timestamp = (datetime.now(timezone.utc) - timedelta(hours=3)).replace(microsecond=0).isoformat()
     table.put_item(Item={'ItemID': item_id, 'Timestamp': timestamp, 'ProgressPercentage': 0})
     print(f"Item {item_id} created.")
+    _save_item_cache(_load_item_cache() | {item_id})
     generate_homepage()
 
 def delete_item():
@@ -467,6 +708,8 @@ def delete_item():
         return
 
     item_id = unique_ids[index]
+    _drop_journal_entries(item_id)
+    _save_item_cache(_load_item_cache() - {item_id})
     to_delete = [i for i in items if i['ItemID'] == item_id]
     for entry in to_delete:
         table.delete_item(Key={'ItemID': entry['ItemID'], 'Timestamp': entry['Timestamp']})
@@ -558,12 +801,16 @@ def print_urls():
         print(f"Couldn't open in Firefox automatically. Please open manually: {target}")
 
 
-def generate_homepage():
-    table = dynamodb.Table(TABLE_NAME)
-    response = table.scan()
+def _scan_all(table, **scan_kwargs):
+    response = table.scan(**scan_kwargs)
     items = response['Items']
-    item_ids = sorted(set(item["ItemID"] for item in items))
+    while 'LastEvaluatedKey' in response:
+        response = table.scan(ExclusiveStartKey=response['LastEvaluatedKey'], **scan_kwargs)
+        items.extend(response['Items'])
+    return items
 
+def render_homepage(items):
+    """Return (index.html, index.json) contents for the given progress rows."""
     latest_entries = {}
     for item in items:
         item_id = item['ItemID']
@@ -573,19 +820,33 @@ def generate_homepage():
 
     latest_progress = sorted(latest_entries.values(), key=lambda x: x['Timestamp'], reverse=True)
 
+    # The page itself stays the same size however many items there are; rows
+    # are rendered client-side from this compact [ItemID, Timestamp, progress] index.
+    # The version is a hash of the contents, not the build time, so an
+    # unchanged site renders identical files and sync can skip them.
+    rows = [[row['ItemID'], row['Timestamp'], int(row['ProgressPercentage'])] for row in latest_progress]
+    version = hashlib.sha1(json.dumps(rows, separators=(',', ':')).encode()).hexdigest()[:12]
+    index = {'version': version, 'items': rows}
+    html = Environment().from_string(HOMEPAGE_TEMPLATE).render(version=version)
+    return html, json.dumps(index, separators=(',', ':'))
 
-    env = Environment()
-    env.filters['urlencode'] = lambda s: quote(str(s), safe='')
-    html = env.from_string(HOMEPAGE_TEMPLATE).render(
-        item_ids=item_ids,
-        latest_progress=latest_progress,
-        base_url=BASE_URL
-    )
+def generate_homepage(table=None):
+    # Only the latest row per item is needed, so fetch just the three fields
+    # and page through the whole table rather than stopping at the first 1 MB.
+    table = table or dynamodb.Table(TABLE_NAME)
+    items = _scan_all(table, ProjectionExpression='ItemID, #ts, ProgressPercentage',
+                      ExpressionAttributeNames={'#ts': 'Timestamp'})
+    _save_item_cache({item['ItemID'] for item in items})
+    html, index_json = render_homepage(items)
 
     os.makedirs("temp", exist_ok=True)
+    with open('temp/index.json', 'w') as f:
+        f.write(index_json)
     with open('temp/index.html', 'w') as f:
         f.write(html)
+    s3.upload_file('temp/index.json', BUCKET_NAME, 'index.json', ExtraArgs={'ContentType': 'application/json'})
     s3.upload_file('temp/index.html', BUCKET_NAME, 'index.html', ExtraArgs={'ContentType': 'text/html'})
+    os.remove('temp/index.json')
     os.remove('temp/index.html')
 
 def update_all_pages():
@@ -595,23 +856,219 @@ def update_all_pages():
     item_ids = sorted(set(item['ItemID'] for item in response['Items']))
 
     for item_id in item_ids:
-        response = table.query(KeyConditionExpression=boto3.dynamodb.conditions.Key('ItemID').eq(item_id))
-        items = sorted(response['Items'], key=lambda x: x['Timestamp'], reverse=True)
+        publish_item_page(table, item_id)
+
+    generate_homepage()
+
 
-        df = pd.DataFrame(items)
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'], format='ISO8601')
-        df['ProgressPercentage'] = df['ProgressPercentage'].astype(int)
+def _json_default(value):
+    """Serialize DynamoDB Decimals when archiving rows."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
-        os.makedirs(f'temp/{item_id}', exist_ok=True)
-        graph_div = create_progress_graph(df, item_id)
-        html = Template(ITEM_TEMPLATE).render(item_id=item_id, data=items, graph_div=graph_div)
-        with open(f'temp/{item_id}/index.html', 'w') as f:
+
+def _rollup_timestamp(ts: str, period: str) -> str:
+    """Start of the daily/weekly bucket a timestamp falls into, in the same ISO format."""
+    start = datetime.fromisoformat(ts).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == 'weekly':
+        start -= timedelta(days=start.weekday())
+    return start.isoformat()
+
+
+def _non_negative_int(value):
+    days = int(value)
+    if days < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {days}")
+    return days
+
+
+def prompt_compact_history():
+    days = input("Roll up rows older than how many days? [30]: ").strip()
+    period = input("Rollup period (daily/weekly) [daily]: ").strip().lower() or 'daily'
+    destination = input("Archive raw rows to (s3/local) [s3]: ").strip().lower() or 's3'
+    try:
+        days = int(days) if days else 30
+    except ValueError:
+        print(f"Invalid number of days: {days!r}.")
+        return
+    if days < 0:
+        print(f"Invalid number of days: {days} (must be 0 or more).")
+        return
+    if period not in ROLLUP_PERIODS:
+        print(f"Invalid rollup period: {period!r} (choose {' or '.join(ROLLUP_PERIODS)}).")
+        return
+    if destination not in ARCHIVE_DESTINATIONS:
+        print(f"Invalid archive destination: {destination!r} (choose {' or '.join(ARCHIVE_DESTINATIONS)}).")
+        return
+    compact_history(days, period, destination)
+
+
+def compact_history(days=30, period='daily', destination='s3', table=None):
+
+    now = (datetime.now(timezone.utc) - timedelta(hours=3)).replace(microsecond=0)
+    cutoff = now - timedelta(days=days)
+
+    table = table or dynamodb.Table(TABLE_NAME)
+    items = _scan_all(table)
+
+    # Group old rows by (item, bucket); existing rollups are merged back in so
+    # re-running with a coarser period (daily -> weekly) keeps folding them.
+    groups = {}
+    for item in items:
+        if datetime.fromisoformat(item['Timestamp']) >= cutoff:
+            continue
+        key = (item['ItemID'], _rollup_timestamp(item['Timestamp'], period))
+        groups.setdefault(key, []).append(item)
+    groups = {
+        key: rows for key, rows in groups.items()
+        if not (len(rows) == 1 and rows[0].get('RollupPeriod') == period and rows[0]['Timestamp'] == key[1])
+    }
+    if not groups:
+        print("Nothing to compact.")
+        return
+
+    rollups = []
+    for (item_id, bucket), rows in groups.items():
+        rows.sort(key=lambda x: x['Timestamp'])
+        rollups.append({
+            'ItemID': item_id,
+            'Timestamp': bucket,
+            'ProgressPercentage': rows[-1]['ProgressPercentage'],
+            'ProgressMin': min(r.get('ProgressMin', r['ProgressPercentage']) for r in rows),
+            'ProgressMax': max(r.get('ProgressMax', r['ProgressPercentage']) for r in rows),
+            'RollupPeriod': period,
+            'RollupCount': sum(r.get('RollupCount', 1) for r in rows),
+        })
+    raw_rows = [row for rows in groups.values() for row in rows]
+
+    # Archive before touching the table so nothing is lost if a later step fails.
+    # The nanosecond/pid suffix keeps back-to-back runs from sharing a name,
+    # and 'x' refuses to overwrite an earlier archive even if they did.
+    stamp = now.strftime('%Y%m%dT%H%M%S')
+    archive_name = f'compaction-{stamp}-{time.time_ns()}-{os.getpid()}.jsonl'
+    archive_path = os.path.join(ARCHIVE_DIR, archive_name)
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    with open(archive_path, 'x') as f:
+        for row in raw_rows:
+            f.write(json.dumps(row, default=_json_default) + '\n')
+    if destination == 's3':
+        archive_key = f'{ARCHIVE_PREFIX}/{archive_name}'
+        s3.upload_file(archive_path, BUCKET_NAME, archive_key, ExtraArgs={'ContentType': 'application/x-ndjson'})
+        os.remove(archive_path)
+        print(f"Archived {len(raw_rows)} rows to s3://{BUCKET_NAME}/{archive_key}")
+    else:
+        print(f"Archived {len(raw_rows)} rows to {archive_path}")
+
+    # A raw row sitting exactly on a bucket boundary shares its key with the
+    # rollup, which overwrites it; deleting it as well would drop the rollup.
+    rollup_keys = {(r['ItemID'], r['Timestamp']) for r in rollups}
+    with table.batch_writer() as batch:
+        for rollup in rollups:
+            batch.put_item(Item=rollup)
+        for row in raw_rows:
+            if (row['ItemID'], row['Timestamp']) not in rollup_keys:
+                batch.delete_item(Key={'ItemID': row['ItemID'], 'Timestamp': row['Timestamp']})
+
+    print(f"Compacted {len(raw_rows)} rows into {len(rollups)} {period} rollups.")
+    update_all_pages()
+
+def build_site(out_dir, table=None):
+    """Render the homepage and every item page into out_dir, laid out like the bucket keys."""
+    # out_dir is replaced wholesale so pages of deleted items don't linger and
+    # get synced back; refuse to wipe a directory that isn't an earlier build.
+    out_dir = out_dir.rstrip(os.sep) or out_dir
+    if os.path.isdir(out_dir) and os.listdir(out_dir) and not os.path.isfile(os.path.join(out_dir, 'index.html')):
+        print(f"{out_dir} is not empty and doesn't look like a previous build; not replacing it.")
+        return
+
+    table = table or dynamodb.Table(TABLE_NAME)
+    items = _scan_all(table)
+
+    by_item = {}
+    for item in items:
+        by_item.setdefault(item['ItemID'], []).append(item)
+
+    parent = os.path.dirname(os.path.abspath(out_dir))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.build-', dir=parent)
+    try:
+        for item_id, rows in sorted(by_item.items()):
+            os.makedirs(os.path.join(staging, item_id), exist_ok=True)
+            with open(os.path.join(staging, item_id, 'index.html'), 'w') as f:
+                f.write(render_item_page(item_id, rows))
+
+        html, index_json = render_homepage(items)
+        with open(os.path.join(staging, 'index.json'), 'w') as f:
+            f.write(index_json)
+        with open(os.path.join(staging, 'index.html'), 'w') as f:
             f.write(html)
+    except BaseException:
+        shutil.rmtree(staging)
+        raise
 
-        s3.upload_file(f'temp/{item_id}/index.html', BUCKET_NAME, f'{item_id}/index.html', ExtraArgs={'ContentType': 'text/html'})
-        shutil.rmtree(f'temp/{item_id}')
+    if os.path.isdir(out_dir):
+        previous = f'{staging}.old'
+        os.replace(out_dir, previous)
+        os.replace(staging, out_dir)
+        shutil.rmtree(previous)
+    else:
+        os.replace(staging, out_dir)
+    print(f"Built homepage and {len(by_item)} item pages in {out_dir}/")
 
-    generate_homepage()
+def _md5(path):
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def sync_site(out_dir, workers=8):
+    """Upload changed files from a build directory and delete bucket objects it no longer has."""
+    if not os.path.isfile(os.path.join(out_dir, 'index.html')):
+        print(f"No index.html in {out_dir}; run build first.")
+        return
+
+    local = {}
+    for root, _, files in os.walk(out_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            local[os.path.relpath(path, out_dir).replace(os.sep, '/')] = path
+
+    remote = {}
+    for page in s3.get_paginator('list_objects_v2').paginate(Bucket=BUCKET_NAME):
+        for obj in page.get('Contents', []):
+            # Compaction archives live in the bucket but are not part of the site.
+            if not obj['Key'].startswith(f'{ARCHIVE_PREFIX}/'):
+                remote[obj['Key']] = obj['ETag'].strip('"')
+
+    # Single-part uploads have the MD5 as their ETag; multipart ETags (with a
+    # '-') never match and those files are simply re-uploaded.
+    to_upload = [key for key, path in local.items() if remote.get(key) != _md5(path)]
+    to_delete = sorted(set(remote) - set(local))
+    skipped = len(local) - len(to_upload)
+
+    def upload(key):
+        content_type = mimetypes.guess_type(key)[0] or 'application/octet-stream'
+        s3.upload_file(local[key], BUCKET_NAME, key, ExtraArgs={'ContentType': content_type})
+        return key
+
+    # Item pages first so the new homepage never links to a page that isn't there yet.
+    homepage = [key for key in to_upload if key in ('index.html', 'index.json')]
+    pages = [key for key in to_upload if key not in homepage]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for key in pool.map(upload, pages):
+            print(f"Uploaded: {key}")
+        for key in pool.map(upload, homepage):
+            print(f"Uploaded: {key}")
+
+    for i in range(0, len(to_delete), 1000):
+        batch = to_delete[i:i + 1000]
+        s3.delete_objects(Bucket=BUCKET_NAME, Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True})
+        for key in batch:
+            print(f"Deleted: {key}")
+
+    print(f"Sync complete: {len(to_upload)} uploaded, {len(to_delete)} deleted, {skipped} unchanged.")
 
 def main():
     while True:
@@ -622,9 +1079,13 @@ Choose an action:
 3. Delete Item
 4. Show Published URLs
 5. Update All Pages (without inserting data)
-6. Exit
+6. Compact History
+7. Flush Journal
+8. Build Site Locally
+9. Sync Built Site to S3
+10. Exit
         """)
-        choice = input("Enter choice [1-6]: ").strip()
+        choice = input("Enter choice [1-10]: ").strip()
         if choice == '1':
             write_progress()
         elif choice == '2':
@@ -636,11 +1097,43 @@ Choose an action:
         elif choice == '5':
             update_all_pages()
         elif choice == '6':
+            prompt_compact_history()
+        elif choice == '7':
+            flush_journal()
+        elif choice == '8':
+            build_site(input("Output directory [site]: ").strip() or 'site')
+        elif choice == '9':
+            sync_site(input("Build directory [site]: ").strip() or 'site')
+        elif choice == '10':
             print("Goodbye!")
             break
         else:
             print("Invalid option. Try again.")
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Track progress in DynamoDB and publish it as a static site on S3.")
+    subparsers = parser.add_subparsers(dest='command')
+    build_parser = subparsers.add_parser('build', help="render the whole site into a local directory")
+    build_parser.add_argument('--out', default='site', help="output directory (default: site)")
+    sync_parser = subparsers.add_parser('sync', help="upload a built site to S3, skipping unchanged files")
+    sync_parser.add_argument('dir', nargs='?', default='site', help="build directory (default: site)")
+    sync_parser.add_argument('--workers', type=int, default=8, help="parallel uploads (default: 8)")
+    subparsers.add_parser('flush', help="write journaled progress to DynamoDB and republish affected pages")
+    compact_parser = subparsers.add_parser('compact', help="roll old history up into daily/weekly rows")
+    compact_parser.add_argument('--days', type=_non_negative_int, default=30, help="roll up rows older than this (default: 30)")
+    compact_parser.add_argument('--period', choices=ROLLUP_PERIODS, default='daily', help="rollup size (default: daily)")
+    compact_parser.add_argument('--archive', choices=ARCHIVE_DESTINATIONS, default='s3',
+                                help="where raw rows are archived (default: s3)")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_site(args.out)
+    elif args.command == 'sync':
+        sync_site(args.dir, workers=args.workers)
+    elif args.command == 'flush':
+        flush_journal()
+    elif args.command == 'compact':
+        compact_history(args.days, args.period, args.archive)
+    else:
+        main()
 
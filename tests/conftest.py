@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# main.py builds its boto3 session at import time; use the default credential
+# chain instead of the maintainer's named profile so it imports anywhere.
+os.environ.setdefault('PROGRESS_AWS_PROFILE', '')
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import main  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    """Keep the journal, item cache and archives out of the real state dir."""
+    state = tmp_path / 'state'
+    state.mkdir()
+    monkeypatch.setattr(main, 'STATE_DIR', str(state))
+    monkeypatch.setattr(main, 'ARCHIVE_DIR', str(state / 'archive'))
+    monkeypatch.setattr(main, 'JOURNAL_PATH', str(state / 'journal.jsonl'))
+    monkeypatch.setattr(main, 'ITEMS_CACHE_PATH', str(state / 'items.json'))
+    monkeypatch.setattr(main, 'PUBLISH_PENDING_PATH', str(state / 'journal.jsonl.publish-pending'))
+    return state
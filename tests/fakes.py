@@ -0,0 +1,88 @@
+"""In-memory stand-ins for the DynamoDB table and S3 client used by main.py."""
+import hashlib
+
+import boto3
+import botocore.exceptions
+
+
+class FakeBatchWriter:
+    def __init__(self, table):
+        self.table = table
+        self.puts = []
+        self.deletes = []
+
+    def __enter__(self):
+        return self
+
+    def put_item(self, Item):
+        self.puts.append(Item)
+
+    def delete_item(self, Key):
+        self.deletes.append(Key)
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            if self.table.fail:
+                raise botocore.exceptions.ClientError(
+                    {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'slow down'}},
+                    'BatchWriteItem')
+            for item in self.puts:
+                self.table.items[(item['ItemID'], item['Timestamp'])] = item
+                self.table.puts += 1
+            for key in self.deletes:
+                del self.table.items[(key['ItemID'], key['Timestamp'])]
+        return False
+
+
+class FakeTable:
+    """Just enough of a DynamoDB Table for flushing, compacting and publishing."""
+
+    def __init__(self, items=()):
+        self.items = {(item['ItemID'], item['Timestamp']): dict(item) for item in items}
+        self.puts = 0
+        self.fail = False
+
+    def batch_writer(self, overwrite_by_pkeys=None):
+        return FakeBatchWriter(self)
+
+    def query(self, KeyConditionExpression):
+        item_id = KeyConditionExpression.get_expression()['values'][1]
+        return {'Items': [dict(item) for (key, _), item in self.items.items() if key == item_id]}
+
+    def scan(self, **kwargs):
+        return {'Items': [dict(item) for item in self.items.values()]}
+
+
+class FakeS3:
+    """Records uploads in order and serves them back from list_objects_v2."""
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = []
+        self.deleted = []
+        self.fail = False
+
+    def upload_file(self, filename, bucket, key, ExtraArgs=None):
+        if self.fail:
+            raise boto3.exceptions.S3UploadFailedError('Failed to upload: connection timed out')
+        with open(filename, 'rb') as f:
+            self.objects[key] = f.read()
+        self.uploads.append(key)
+
+    def put(self, key, body):
+        self.objects[key] = body
+
+    def delete_objects(self, Bucket, Delete):
+        for obj in Delete['Objects']:
+            self.objects.pop(obj['Key'], None)
+            self.deleted.append(obj['Key'])
+
+    def get_paginator(self, name):
+        assert name == 'list_objects_v2'
+        return self
+
+    def paginate(self, Bucket):
+        yield {'Contents': [
+            {'Key': key, 'Size': len(body), 'ETag': f'"{hashlib.md5(body).hexdigest()}"'}
+            for key, body in sorted(self.objects.items())
+        ]}
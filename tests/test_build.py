@@ -0,0 +1,74 @@
+import filecmp
+import os
+
+import main
+from fakes import FakeS3, FakeTable
+
+
+ITEMS = [
+    {'ItemID': 'alpha', 'Timestamp': '2026-01-01T10:00:00+00:00', 'ProgressPercentage': 10},
+    {'ItemID': 'alpha', 'Timestamp': '2026-01-02T10:00:00+00:00', 'ProgressPercentage': 25},
+    {'ItemID': 'beta gamma', 'Timestamp': '2026-01-03T09:30:00+00:00', 'ProgressPercentage': 70},
+]
+
+
+def tree(root):
+    return sorted(os.path.relpath(os.path.join(d, name), root) for d, _, files in os.walk(root) for name in files)
+
+
+def test_build_writes_bucket_layout(tmp_path):
+    main.build_site(str(tmp_path / 'site'), table=FakeTable(ITEMS))
+
+    assert tree(tmp_path / 'site') == ['alpha/index.html', 'beta gamma/index.html', 'index.html', 'index.json']
+
+
+def test_rebuilding_unchanged_data_is_byte_identical(tmp_path):
+    main.build_site(str(tmp_path / 'a'), table=FakeTable(ITEMS))
+    main.build_site(str(tmp_path / 'b'), table=FakeTable(ITEMS))
+
+    files = tree(tmp_path / 'a')
+    match, mismatch, errors = filecmp.cmpfiles(tmp_path / 'a', tmp_path / 'b', files, shallow=False)
+    assert (mismatch, errors) == ([], [])
+
+
+def test_changed_progress_only_changes_that_item_and_the_index(tmp_path):
+    main.build_site(str(tmp_path / 'a'), table=FakeTable(ITEMS))
+    updated = ITEMS + [{'ItemID': 'alpha', 'Timestamp': '2026-01-04T10:00:00+00:00', 'ProgressPercentage': 40}]
+    main.build_site(str(tmp_path / 'b'), table=FakeTable(updated))
+
+    files = tree(tmp_path / 'a')
+    _, mismatch, _ = filecmp.cmpfiles(tmp_path / 'a', tmp_path / 'b', files, shallow=False)
+    assert sorted(mismatch) == ['alpha/index.html', 'index.html', 'index.json']
+
+
+def test_rebuild_drops_pages_of_deleted_items(tmp_path):
+    out = str(tmp_path / 'site')
+    main.build_site(out, table=FakeTable(ITEMS))
+    main.build_site(out, table=FakeTable([item for item in ITEMS if item['ItemID'] == 'alpha']))
+
+    assert tree(out) == ['alpha/index.html', 'index.html', 'index.json']
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.build-')] == []
+
+
+def test_build_refuses_to_replace_an_unrelated_directory(tmp_path):
+    (tmp_path / 'notes.txt').write_text('keep me')
+
+    main.build_site(str(tmp_path), table=FakeTable(ITEMS))
+
+    assert tree(tmp_path) == ['notes.txt']
+
+
+def test_published_pages_match_the_build(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = FakeS3()
+    monkeypatch.setattr(main, 's3', client)
+    table = FakeTable(ITEMS)
+
+    main.build_site('site', table=table)
+    main.publish_item_page(table, 'alpha')
+    main.publish_item_page(table, 'beta gamma')
+    main.generate_homepage(table)
+
+    for key in tree('site'):
+        with open(os.path.join('site', key), 'rb') as f:
+            assert client.objects[key] == f.read(), key
@@ -0,0 +1,142 @@
+import json
+import os
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+import main
+from fakes import FakeS3, FakeTable
+
+# compact_history shifts now() back three hours, so this makes "now"
+# 2026-02-10T12:00 and the 30-day cutoff 2026-01-11T12:00.
+FROZEN_NOW = datetime(2026, 2, 10, 15, 0, tzinfo=timezone.utc)
+RECENT = {'ItemID': 'alpha', 'Timestamp': '2026-02-09T10:00:00+00:00', 'ProgressPercentage': Decimal(90)}
+
+
+class FrozenDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return FROZEN_NOW.astimezone(tz)
+
+
+@pytest.fixture(autouse=True)
+def frozen(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, 'datetime', FrozenDatetime)
+    monkeypatch.setattr(main, 'update_all_pages', lambda: None)
+    monkeypatch.setattr(main, 's3', FakeS3())
+
+
+def row(ts, progress, **extra):
+    return {'ItemID': 'alpha', 'Timestamp': ts, 'ProgressPercentage': Decimal(progress), **extra}
+
+
+def rollup(ts, last, low, high, count, period='daily'):
+    return row(ts, last, ProgressMin=Decimal(low), ProgressMax=Decimal(high),
+               RollupPeriod=period, RollupCount=Decimal(count))
+
+
+def compact(table, period='daily', destination='local'):
+    main.compact_history(30, period, destination, table=table)
+
+
+def archived_rows():
+    rows = []
+    for name in sorted(os.listdir(main.ARCHIVE_DIR)):
+        with open(os.path.join(main.ARCHIVE_DIR, name)) as f:
+            rows.extend(json.loads(line) for line in f)
+    return rows
+
+
+def test_raw_rows_roll_up_into_last_min_max_count():
+    table = FakeTable([row('2026-01-03T09:00:00+00:00', 20), row('2026-01-03T15:00:00+00:00', 10),
+                       row('2026-01-03T20:00:00+00:00', 15), RECENT])
+
+    compact(table)
+
+    assert table.items == {
+        ('alpha', '2026-01-03T00:00:00+00:00'): {
+            'ItemID': 'alpha', 'Timestamp': '2026-01-03T00:00:00+00:00', 'ProgressPercentage': Decimal(15),
+            'ProgressMin': Decimal(10), 'ProgressMax': Decimal(20), 'RollupPeriod': 'daily', 'RollupCount': 3,
+        },
+        ('alpha', RECENT['Timestamp']): RECENT,
+    }
+
+
+def test_row_on_bucket_boundary_is_overwritten_not_deleted():
+    table = FakeTable([row('2026-01-03T00:00:00+00:00', 5), row('2026-01-03T10:00:00+00:00', 8)])
+
+    compact(table)
+
+    assert list(table.items.values()) == [rollup('2026-01-03T00:00:00+00:00', 8, 5, 8, 2)]
+
+
+def test_existing_rollup_is_merged_when_its_bucket_straddles_the_cutoff():
+    table = FakeTable([rollup('2026-01-11T00:00:00+00:00', 40, 30, 40, 2),
+                       row('2026-01-11T08:00:00+00:00', 45), row('2026-01-11T18:00:00+00:00', 50)])
+
+    compact(table)
+
+    assert table.items == {
+        ('alpha', '2026-01-11T00:00:00+00:00'): rollup('2026-01-11T00:00:00+00:00', 45, 30, 45, 3),
+        ('alpha', '2026-01-11T18:00:00+00:00'): row('2026-01-11T18:00:00+00:00', 50),
+    }
+
+
+def test_daily_rollups_fold_into_weekly():
+    # 2026-01-05 is a Monday.
+    table = FakeTable([rollup('2026-01-05T00:00:00+00:00', 20, 10, 25, 2),
+                       rollup('2026-01-07T00:00:00+00:00', 35, 15, 35, 3), RECENT])
+
+    compact(table, period='weekly')
+
+    assert table.items == {
+        ('alpha', '2026-01-05T00:00:00+00:00'): rollup('2026-01-05T00:00:00+00:00', 35, 10, 35, 5, 'weekly'),
+        ('alpha', RECENT['Timestamp']): RECENT,
+    }
+
+
+def test_single_rollup_already_at_the_period_is_left_alone():
+    existing = rollup('2026-01-05T00:00:00+00:00', 20, 10, 25, 2)
+    table = FakeTable([existing, RECENT])
+
+    compact(table)
+
+    assert table.puts == 0
+    assert not os.path.exists(main.ARCHIVE_DIR)
+
+
+def test_archive_holds_exactly_the_removed_rows():
+    old = [row('2026-01-03T00:00:00+00:00', 5), row('2026-01-03T10:00:00+00:00', 8),
+           row('2026-01-04T10:00:00+00:00', 12)]
+    table = FakeTable(old + [RECENT])
+
+    compact(table)
+
+    assert archived_rows() == [
+        {'ItemID': 'alpha', 'Timestamp': r['Timestamp'], 'ProgressPercentage': int(r['ProgressPercentage'])}
+        for r in old
+    ]
+
+
+def test_back_to_back_compactions_keep_both_archives():
+    table = FakeTable([row('2026-01-05T10:00:00+00:00', 10), row('2026-01-07T10:00:00+00:00', 20)])
+
+    compact(table)
+    compact(table, period='weekly')
+
+    assert len(os.listdir(main.ARCHIVE_DIR)) == 2
+    assert len(archived_rows()) == 4
+
+
+def test_archive_to_s3_uploads_under_the_archive_prefix():
+    table = FakeTable([row('2026-01-05T10:00:00+00:00', 10)])
+
+    compact(table, destination='s3')
+
+    [key] = main.s3.uploads
+    assert key.startswith('archive/compaction-') and key.endswith('.jsonl')
+    assert json.loads(main.s3.objects[key]) == {'ItemID': 'alpha', 'Timestamp': '2026-01-05T10:00:00+00:00',
+                                                'ProgressPercentage': 10}
+    assert os.listdir(main.ARCHIVE_DIR) == []
@@ -0,0 +1,43 @@
+import json
+from decimal import Decimal
+
+import main
+
+ITEMS = [
+    {'ItemID': 'alpha', 'Timestamp': '2026-01-01T10:00:00+00:00', 'ProgressPercentage': Decimal(10)},
+    {'ItemID': 'alpha', 'Timestamp': '2026-01-05T10:00:00+00:00', 'ProgressPercentage': Decimal(35)},
+    {'ItemID': 'beta', 'Timestamp': '2026-01-03T10:00:00+00:00', 'ProgressPercentage': Decimal(80)},
+    {'ItemID': 'gamma', 'Timestamp': '2026-01-04T10:00:00+00:00', 'ProgressPercentage': Decimal(0)},
+    {'ItemID': 'gamma', 'Timestamp': '2026-01-02T10:00:00+00:00', 'ProgressPercentage': Decimal(5)},
+]
+
+
+def test_index_has_latest_row_per_item_newest_first():
+    _, index_json = main.render_homepage(ITEMS)
+    index = json.loads(index_json)
+
+    assert index['items'] == [
+        ['alpha', '2026-01-05T10:00:00+00:00', 35],
+        ['gamma', '2026-01-04T10:00:00+00:00', 0],
+        ['beta', '2026-01-03T10:00:00+00:00', 80],
+    ]
+    assert all(type(progress) is int for _, _, progress in index['items'])
+
+
+def test_homepage_fetches_the_versioned_index_without_item_rows():
+    html, index_json = main.render_homepage(ITEMS)
+    version = json.loads(index_json)['version']
+
+    assert f"fetch('index.json?v={version}')" in html
+    assert '<tbody id="tableBody"></tbody>' in html
+    for item_id in ('alpha', 'beta', 'gamma'):
+        assert item_id not in html
+
+
+def test_version_follows_the_index_contents():
+    _, first = main.render_homepage(ITEMS)
+    _, again = main.render_homepage(list(reversed(ITEMS)))
+    _, changed = main.render_homepage(ITEMS[:-1] + [dict(ITEMS[-1], Timestamp='2026-01-06T10:00:00+00:00')])
+
+    assert json.loads(first)['version'] == json.loads(again)['version']
+    assert json.loads(first)['version'] != json.loads(changed)['version']
@@ -0,0 +1,148 @@
+import glob
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import main
+from fakes import FakeS3, FakeTable
+
+
+@pytest.fixture
+def table():
+    return FakeTable()
+
+
+@pytest.fixture(autouse=True)
+def fake_s3(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = FakeS3()
+    monkeypatch.setattr(main, 's3', client)
+    return client
+
+
+def entry(item_id, ts, progress):
+    return {'ItemID': item_id, 'Timestamp': ts, 'ProgressPercentage': progress}
+
+
+def journal_files():
+    return sorted(glob.glob(f'{main.JOURNAL_PATH}*'))
+
+
+def test_flush_writes_entries_and_publishes_affected_items(table, fake_s3):
+    main._append_journal(entry('alpha', '2026-01-01T10:00:00+00:00', 10))
+    main._append_journal(entry('alpha', '2026-01-02T10:00:00+00:00', 20))
+    main._append_journal(entry('beta', '2026-01-02T11:00:00+00:00', 5))
+
+    main.flush_journal(table=table)
+
+    assert sorted(table.items) == [
+        ('alpha', '2026-01-01T10:00:00+00:00'),
+        ('alpha', '2026-01-02T10:00:00+00:00'),
+        ('beta', '2026-01-02T11:00:00+00:00'),
+    ]
+    assert sorted(fake_s3.objects) == ['alpha/index.html', 'beta/index.html', 'index.html', 'index.json']
+    assert journal_files() == []
+
+
+def test_leftover_claim_is_merged_and_retried(table):
+    # A previous flush crashed after claiming the journal.
+    with open(f'{main.JOURNAL_PATH}.flushing', 'w') as f:
+        f.write(json.dumps(entry('alpha', '2026-01-01T10:00:00+00:00', 10)) + '\n')
+    main._append_journal(entry('beta', '2026-01-02T10:00:00+00:00', 30))
+
+    main.flush_journal(table=table)
+
+    assert sorted(table.items) == [('alpha', '2026-01-01T10:00:00+00:00'), ('beta', '2026-01-02T10:00:00+00:00')]
+    assert journal_files() == []
+
+
+def test_torn_last_line_is_skipped(table):
+    with open(main.JOURNAL_PATH, 'w') as f:
+        f.write(json.dumps(entry('alpha', '2026-01-01T10:00:00+00:00', 10)) + '\n')
+        f.write('{"ItemID": "alpha", "Timest')
+    main._append_journal(entry('alpha', '2026-01-02T10:00:00+00:00', 20))
+
+    main.flush_journal(table=table)
+
+    assert sorted(table.items) == [('alpha', '2026-01-01T10:00:00+00:00'), ('alpha', '2026-01-02T10:00:00+00:00')]
+
+
+def test_failed_batch_write_keeps_claim_for_next_flush(table):
+    main._append_journal(entry('alpha', '2026-01-01T10:00:00+00:00', 10))
+    table.fail = True
+
+    main.flush_journal(table=table)
+
+    assert table.items == {}
+    claims = journal_files()
+    assert len(claims) == 1 and claims[0].endswith('.flushing')
+    assert main._read_journal(claims[0]) == [entry('alpha', '2026-01-01T10:00:00+00:00', 10)]
+
+    table.fail = False
+    main.flush_journal(table=table)
+
+    assert list(table.items) == [('alpha', '2026-01-01T10:00:00+00:00')]
+    assert journal_files() == []
+
+
+def test_resending_same_key_is_idempotent(table):
+    # Half-flushed: the entry reached DynamoDB but the claim was never removed.
+    sent = entry('alpha', '2026-01-01T10:00:00+00:00', 10)
+    table.items[('alpha', sent['Timestamp'])] = dict(sent)
+    with open(f'{main.JOURNAL_PATH}.flushing', 'w') as f:
+        f.write(json.dumps(sent) + '\n')
+    main._append_journal(sent)
+
+    main.flush_journal(table=table)
+
+    assert table.items == {('alpha', sent['Timestamp']): sent}
+    assert table.puts == 1
+
+
+def test_failed_publish_is_retried_on_next_flush(table, fake_s3):
+    main._append_journal(entry('alpha', '2026-01-01T10:00:00+00:00', 10))
+    fake_s3.fail = True
+
+    main.flush_journal(table=table)
+
+    assert list(table.items) == [('alpha', '2026-01-01T10:00:00+00:00')]
+    assert journal_files() == [main.PUBLISH_PENDING_PATH]
+
+    fake_s3.fail = False
+    main.flush_journal(table=table)
+
+    assert 'alpha/index.html' in fake_s3.objects
+    assert journal_files() == []
+
+
+def test_dropping_an_item_removes_it_from_journal_and_claims():
+    with open(f'{main.JOURNAL_PATH}.flushing', 'w') as f:
+        f.write(json.dumps(entry('alpha', '2026-01-01T10:00:00+00:00', 10)) + '\n')
+        f.write(json.dumps(entry('beta', '2026-01-01T11:00:00+00:00', 10)) + '\n')
+    main._append_journal(entry('alpha', '2026-01-02T10:00:00+00:00', 20))
+
+    main._drop_journal_entries('alpha')
+
+    assert [e['ItemID'] for e in main._pending_entries()] == ['beta']
+
+
+def test_append_blocked_by_a_claim_goes_to_the_fresh_journal():
+    first = entry('alpha', '2026-01-01T10:00:00+00:00', 10)
+    second = entry('alpha', '2026-01-02T10:00:00+00:00', 20)
+    main._append_journal(first)
+
+    # Play the flusher: hold the lock while the appender opens the old file.
+    held = main._lock_journal('rb')
+    writer = threading.Thread(target=main._append_journal, args=(second,))
+    writer.start()
+    time.sleep(0.2)
+    claim = f'{main.JOURNAL_PATH}.1-1.flushing'
+    os.replace(main.JOURNAL_PATH, claim)
+    held.close()
+    writer.join(timeout=5)
+
+    assert main._read_journal(claim) == [first]
+    assert main._read_journal(main.JOURNAL_PATH) == [second]
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+import main
+from fakes import FakeS3, FakeTable
+
+ITEMS = [
+    {'ItemID': 'alpha', 'Timestamp': '2026-01-01T10:00:00+00:00', 'ProgressPercentage': 10},
+    {'ItemID': 'beta', 'Timestamp': '2026-01-02T10:00:00+00:00', 'ProgressPercentage': 50},
+    {'ItemID': 'gamma', 'Timestamp': '2026-01-03T10:00:00+00:00', 'ProgressPercentage': 90},
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    client = FakeS3()
+    monkeypatch.setattr(main, 's3', client)
+    main.build_site('site', table=FakeTable(ITEMS))
+    return client
+
+
+def read(path):
+    with open(os.path.join('site', path), 'rb') as f:
+        return f.read()
+
+
+def test_first_sync_uploads_everything_with_homepage_last(client):
+    main.sync_site('site')
+
+    assert sorted(client.uploads) == ['alpha/index.html', 'beta/index.html', 'gamma/index.html',
+                                      'index.html', 'index.json']
+    assert set(client.uploads[-2:]) == {'index.html', 'index.json'}
+
+
+def test_unchanged_files_are_skipped_and_changed_ones_uploaded(client):
+    for key in ('alpha/index.html', 'gamma/index.html', 'index.html', 'index.json'):
+        client.put(key, read(key))
+    client.put('beta/index.html', b'<html>stale</html>')
+
+    main.sync_site('site')
+
+    assert client.uploads == ['beta/index.html']
+    assert client.objects['beta/index.html'] == read('beta/index.html')
+    assert client.deleted == []
+
+
+def test_stale_keys_are_deleted_but_archives_survive(client):
+    main.sync_site('site')
+    client.uploads.clear()
+    client.put('removed/index.html', b'<html>gone</html>')
+    client.put('archive/compaction-1.jsonl', b'{}\n')
+
+    main.sync_site('site')
+
+    assert client.uploads == []
+    assert client.deleted == ['removed/index.html']
+    assert 'archive/compaction-1.jsonl' in client.objects
+
+
+def test_sync_refuses_a_directory_without_a_build(client, tmp_path):
+    os.makedirs('empty')
+
+    main.sync_site('empty')
+
+    assert client.uploads == [] and client.deleted == []